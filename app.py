@@ -39,17 +39,42 @@ Stretch Goals (optional for now):
 - Store previous sessions locally (simulate dashboard history).
 """
 
+import math
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+from echolon.charts import DARK_TEMPLATE, benchmark_fig, roi_channel_fig, rev_exp_fig
+from echolon.data import (generate_sample_data, generate_benchmark_data, validate_columns,
+                          month_slice, compute_anomalies, stats_and_anomalies, source_hash, compute_kpis,
+                          detect_column_map, mapped_frame, metric_means, preview_frame)
+from echolon.scenario import project
+from echolon.sources import load_csv, fetch_api_csv, fetch_gsheet, parse_headers, store_df, get_df
+from echolon.theme import inject_theme
 
 # Dark theme settings
 st.set_page_config(page_title='Echolon AI Dashboard', layout='wide')
-st.markdown('<style>body { background-color: #20223a; color: white; }</style>', unsafe_allow_html=True)
+inject_theme()
+
+_MONTHS = ('All months', 'January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+_MONTH_IDX = range(0, 13)
 
-# Sidebar
-st.sidebar.title('Echolon AI')
-st.sidebar.markdown('Analytics & Business Intelligence')
+# Sidebar — built by exactly one function so no widget is registered twice
+def render_sidebar():
+    """Render the sidebar and return the selected month (0 = all)."""
+    with st.sidebar:
+        st.title('Echolon AI')
+        st.markdown('Analytics & Business Intelligence')
+        selected = st.selectbox('Focus month', _MONTH_IDX, format_func=_MONTHS.__getitem__)
+        with st.expander('Login (mock)'):
+            st.text_input('Username')
+            st.text_input('Password', type='password')
+    return selected
+
+selected_month = render_sidebar()
 
 # Placeholder section titles with icons
 def section_title(icon, title):
@@ -58,42 +83,203 @@ def section_title(icon, title):
 # 1. Upload & Data Integration
 section_title('⬆️','Upload & Data Integration')
 uploaded_file = st.file_uploader('Upload your CSV', type=['csv'])
+with st.expander('Or connect an API / Google Sheet'):
+    endpoint = st.text_input('CSV API endpoint URL')
+    custom_headers = st.text_input('Request headers (JSON, optional)')
+    sheet_url = st.text_input('Google Sheet URL')
+
 df = None
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-    st.write('Preview of uploaded data:')
-    st.dataframe(df.head())
+    try:
+        df = load_csv(uploaded_file.getvalue())
+    except Exception as e:
+        st.error(f'Upload parse failed: {e}')
+elif endpoint:
+    try:
+        df = fetch_api_csv(endpoint, parse_headers(custom_headers))
+    except Exception as e:
+        st.error(f'API fetch failed: {e}')
+elif sheet_url:
+    try:
+        df = fetch_gsheet(sheet_url)
+    except Exception as e:
+        st.error(f'Google Sheets load failed: {e}')
 
-# 2. Industry Benchmarking
-section_title('📈','Benchmarking')
 if df is not None:
-    st.write('Sample benchmarking (static example):')
-    st.markdown('- Revenue: 15% below industry average')
-    st.markdown('- Orders: 3% above industry average')
-    st.markdown('<span style="color:red">Below</span> / <span style="color:green">Above</span>', unsafe_allow_html=True)
+    # Register the source once per content hash; stats/anomalies for the
+    # loop below are memoized on that hash, so non-data interactions
+    # never re-touch the frames.
+    source_name = uploaded_file.name if uploaded_file else (endpoint or sheet_url)
+    sources = st.session_state.setdefault('data_sources', {'names': [], 'df_ids': [], 'hashes': []})
+    df_key = source_hash(df)
+    if df_key not in sources['hashes']:
+        sources['names'].append(source_name)
+        sources['df_ids'].append(store_df(df))
+        sources['hashes'].append(df_key)
+    if df.attrs.get('sampled'):
+        st.warning('Large upload: showing the first 100,000 rows only.')
+    ok, missing = validate_columns(df, ['Date', 'Revenue'])
+    if not ok:
+        st.warning(f"Missing expected columns: {', '.join(missing)} — some sections may be limited.")
+    st.write('Preview of loaded data:')
+    st.table(preview_frame(df))
+    if len(df.columns) > 50:
+        st.caption(f'Preview clipped to the first 50 of {len(df.columns)} columns.')
+    detected = detect_column_map(tuple(df.columns))
+    if detected:
+        st.caption('Auto-detected columns: ' + ', '.join(f'{r} → {c}' for r, c in detected.items()))
 else:
-    st.info('Upload data to see benchmarking.')
+    df = generate_sample_data()
+    df_key = 'demo'
+    st.info('No data source connected — showing demo data.')
+    st.table(preview_frame(df))
+
+anomalies = compute_anomalies(df)
+if anomalies:
+    with st.expander('⚠️ Data quality checks'):
+        for col, msgs in anomalies.items():
+            st.warning(f"{col}: {'; '.join(msgs)}")
+
+_sources = st.session_state.get('data_sources', {'names': (), 'df_ids': (), 'hashes': ()})
+for src_name, src_id, src_hash in zip(_sources['names'], _sources['df_ids'], _sources['hashes']):
+    src_df = get_df(src_id)
+    if src_df is None:
+        continue
+    with st.expander(f"Source: {src_name}"):
+        src_map = detect_column_map(tuple(src_df.columns))
+        src_view = mapped_frame(src_df, src_hash, src_map)
+        ds_stats, ds_anoms = stats_and_anomalies((src_hash, tuple(sorted(src_map.items()))), src_view)
+        st.dataframe(ds_stats, use_container_width=True)
+        for col, msgs in ds_anoms.items():
+            st.warning(f"{col}: {'; '.join(msgs)}")
+
+# Hash-based column lookups for all downstream presence checks
+cols = set(df.columns)
+col_map = detect_column_map(tuple(df.columns))
+
+# Month filter: searchsorted slice (view) rather than a boolean-mask copy
+view = month_slice(df, selected_month) if selected_month and 'Date' in cols else df
+
+# One pandas->NumPy transition per column, shared by every section below
+date_arr = view['Date'].to_numpy() if 'Date' in cols else None
+rev_arr = view['Revenue'].to_numpy() if 'Revenue' in cols else None
+cust_arr = view['Customers'].to_numpy() if 'Customers' in cols else None
+
+# Columns that can actually be aggregated; name matches with string or
+# date content (e.g. currency text) must not reach the numeric reducers
+num_cols = {c for c in cols if pd.api.types.is_numeric_dtype(view[c])}
+
+# KPI cards — one cached agg pass instead of three column scans per rerun
+if {'Revenue', 'Expenses', 'Customers'} <= num_cols:
+    kpi_rev, kpi_exp, kpi_cust = compute_kpis((df_key, selected_month), view,
+                                              ('Revenue', 'Expenses', 'Customers'))
+    c1, c2, c3 = st.columns(3)
+    c1.metric('Total Revenue', f'${kpi_rev:,.0f}')
+    c2.metric('Total Expenses', f'${kpi_exp:,.0f}')
+    c3.metric('Avg. Customers', f'{kpi_cust:,.0f}')
+
+# 2. Industry Benchmarking
+section_title('📈','Benchmarking')
+benchmarks = generate_benchmark_data()
+# One fused mean pass over the present metrics, shared by the loop below
+present_metrics = tuple(m for m in benchmarks['Metric'] if m in num_cols)
+actual_means = metric_means((df_key, selected_month), view, present_metrics) if present_metrics else {}
+bench_metrics = []
+bench_diffs = []
+for _, row in benchmarks.iterrows():
+    metric = row['Metric']
+    if metric not in cols:
+        continue
+    actual = actual_means[metric]
+    if pd.isna(actual):
+        # All-null column: nothing to compare, skip without a rescan
+        continue
+    diff_pct = (actual - row['Industry_Average']) / row['Industry_Average'] * 100
+    bench_metrics.append(metric)
+    bench_diffs.append(round(float(diff_pct), 1))
+    color = 'green' if diff_pct >= 0 else 'red'
+    direction = 'above' if diff_pct >= 0 else 'below'
+    st.markdown(
+        f"- {metric}: <span style='color:{color}'>{abs(diff_pct):.1f}% {direction}</span> industry average",
+        unsafe_allow_html=True,
+    )
+if bench_metrics:
+    st.plotly_chart(benchmark_fig(tuple(bench_metrics), tuple(bench_diffs)), use_container_width=True, key="benchmark_diffs")
+if {'Date', 'Revenue', 'Expenses'} <= cols:
+    # One C-level resample bins both columns at once; no per-column
+    # groupby over raw date values.
+    agg_df = view[['Date', 'Revenue', 'Expenses']].set_index('Date').resample('D').sum()
+    trend = rev_exp_fig((df_key, selected_month), agg_df.index,
+                        agg_df['Revenue'].to_numpy(), agg_df['Expenses'].to_numpy())
+    st.plotly_chart(trend, use_container_width=True, key="rev_exp_trend")
 
 # 3. What If? Scenario Modeling
+@st.fragment
+def scenario_section(dates, revenue, customers):
+    """Slider-driven block; fragment-scoped so slider moves rerun only
+    this section instead of the whole script."""
+    ad_spend = st.slider('Ad Spend % Change', -50, 50, 0)
+    price_change = st.slider('Price % Change', -25, 25, 0)
+    churn_change = st.slider('Churn Rate Change', -10, 10, 0)
+    proj_rev, _ = project(
+        revenue,
+        customers,
+        price_f=1 + price_change / 100,
+        spend_f=1 + ad_spend / 100,
+        churn_delta=churn_change / 100,
+    )
+    scenario_df = pd.DataFrame({
+        'Date': dates,
+        'Current Revenue': revenue,
+        'Projected Revenue': proj_rev,
+    })
+    fig = px.line(scenario_df, x='Date', y=['Current Revenue', 'Projected Revenue'], title='Projected Revenue')
+    st.plotly_chart(fig, key="scenario_projection")
+
 section_title('🔮','What If? Scenario Modeling')
-ad_spend = st.slider('Ad Spend % Change', -50, 50, 0)
-price_change = st.slider('Price % Change', -25, 25, 0)
-churn_change = st.slider('Churn Rate Change', -10, 10, 0)
-if df is not None:
-    st.write('Plotly chart placeholder here')
-    fig = px.line(x=[0,1,2], y=[100,110,105], title='Projected Revenue')
-    st.plotly_chart(fig)
+if {'Date', 'Revenue'} <= cols:
+    scenario_section(date_arr, rev_arr, cust_arr)
 else:
-    st.info('Upload data for scenario modeling.')
+    st.info('Upload data with Date and Revenue columns for scenario modeling.')
 
 # 4. Goal Tracking
 section_title('🎯','Goal Tracking')
 revenue_goal = st.number_input('Set Revenue Target', value=10000)
 conversion_goal = st.number_input('Conversion Rate Target (%)', value=10)
 orders_goal = st.number_input('Orders Target', value=50)
-st.progress(0.5, text='Revenue Target Progress (50%)')
-st.progress(0.8, text='Conversion Rate Progress (80%)')
-st.progress(0.3, text='Orders Target Progress (30%)')
+# One fused agg pass covers every goal metric present in the data
+goal_specs = (
+    ('revenue', revenue_goal, 'sum', 'Revenue Target'),
+    ('conversion', conversion_goal, 'mean', 'Conversion Rate Target'),
+    ('orders', orders_goal, 'sum', 'Orders Target'),
+)
+# Only numeric detected columns take part — a string- or date-typed
+# match would make the fused agg below raise
+goal_funcs = {col_map[role]: how for role, _goal, how, _label in goal_specs
+              if role in col_map and pd.api.types.is_numeric_dtype(view[col_map[role]])}
+goal_agg = view.agg(goal_funcs) if goal_funcs else None
+for role, goal, _how, label in goal_specs:
+    if goal_agg is not None and col_map.get(role) in goal_funcs and goal:
+        # Clamp to [0, 1]: negative targets and NaN aggregates (empty
+        # month view, all-null column) would otherwise crash st.progress
+        ratio = float(goal_agg[col_map[role]]) / goal
+        progress = max(0.0, min(ratio, 1.0)) if math.isfinite(ratio) else 0.0
+        st.progress(progress, text=f'{label} Progress ({progress:.0%})')
+    else:
+        st.progress(0.0, text=f'{label}: no matching column in data')
+if {'Date', 'Revenue'} <= cols:
+    monthly = df.groupby(df['Date'].dt.month)['Revenue'].sum()
+    # Reuse one Figure across reruns and swap only the data arrays, so
+    # the websocket diff carries new y-values instead of a full layout.
+    if 'goal_fig' not in st.session_state:
+        fig = go.Figure(go.Bar(x=list(range(1, 13)), marker_color='#3ECF8E'))
+        fig.update_layout(title='Monthly Revenue', xaxis_title='Month', yaxis_title='Revenue',
+                          template=DARK_TEMPLATE, margin=dict(l=20, r=20, t=40, b=20))
+        st.session_state.goal_fig = fig
+    goal_fig = st.session_state.goal_fig
+    goal_fig.data[0].x = monthly.index.to_numpy()
+    goal_fig.data[0].y = monthly.to_numpy()
+    st.plotly_chart(goal_fig, use_container_width=True, key="goal_monthly_rev")
 st.markdown('AI Suggestions for Goal Recovery:')
 st.markdown('- Reallocate 10–15% from underperforming channels.')
 st.markdown('- Increase pricing tiers by +5% if churn < 3%.')
@@ -103,6 +289,7 @@ section_title('🧠','AI Insights & Recommendations')
 st.markdown('Mock AI suggestions:')
 st.markdown('- Customer retention dropped due to inconsistent purchase frequency.')
 st.markdown('- Your ad spend ROI is strongest on Mondays — consider reallocating.')
+st.plotly_chart(roi_channel_fig(), use_container_width=True, key="roi_by_channel")
 
 # 6. Collaboration
 section_title('💬','Collaboration')
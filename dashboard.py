@@ -1,101 +1,215 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objs as go
-from datetime import datetime, timedelta
-
-# Custom dark theme styling
-st.markdown(
-    '''
-    body, .stApp {background-color: #181C24!important; color: #F3F6F9!important;}
-    .st-emotion-cache-2trqyj {color: #3ECF8E!important;}
-    .st-emotion-cache-1v0mbdj, .st-emotion-cache-1p66bqe {background: #111217 !important;}
-    header {background: none!important;}
-    .urgent {color:red; font-weight: bold;}
-    .owner {color:#3ECF8E!important;}
-    .metric-card {background: #202634; border-radius: 16px; padding: 24px 8px; text-align: center; margin:8px; color:#F3F6F9}
-    .kpiIcon {font-size:32px; margin-bottom:8px;}
-    ''' , unsafe_allow_html=True)
+from datetime import datetime
+
+from echolon.data import generate_sample_data, validate_columns, detect_column_map, preview_frame
+from echolon.sources import load_csv
+from echolon.theme import inject_theme
+
 st.set_page_config(page_title="Echolon AI Dashboard", layout="wide", initial_sidebar_state="expanded")
+inject_theme()
 #------------------ Module Scaffold Logic ------------------#
-def overview_module():
-    st.markdown("## 📋 Overview")
-    with st.expander("Platform Features", expanded=True):
-        st.markdown("""
+# Static copy lives at module level; the dispatch path below re-runs a
+# module body on every interaction, so the render calls only reference
+# these constants instead of rebuilding them.
+_FEATURES_MD = """
         - Modular dashboard navigation (sidebar)
         - AI-driven tips and insights
         - Scenario modeling and benchmarking
         - Goal tracking and achievements
         - Collaboration tools and feedback
-        """)
+        """
+_COMPARISON_MD = (
+    "### 🆚 **Echolon vs. Visa Analytics Dashboards**\n- Flexible data, no locked models\n- Personalization and AI\n- Gamified progress and achievements\n- **Free for startups/SMBs!**"
+)
+_STRETCH_MD = "- Predictive analytics\n- Real user feedback integration\n- Automated report generation\n- Many more (see GitHub issues)"
+
+
+def overview_module():
+    st.markdown("## 📋 Overview")
+    with st.expander("Platform Features", expanded=True):
+        st.markdown(_FEATURES_MD)
         st.info("Use the sidebar to navigate modules – each module is ready for future logic.")
     st.markdown("---")
-    st.markdown(
-        "### 🆚 **Echolon vs. Visa Analytics Dashboards**\n- Flexible data, no locked models\n- Personalization and AI\n- Gamified progress and achievements\n- **Free for startups/SMBs!**"
-    )
+    st.markdown(_COMPARISON_MD)
 def data_upload_module():
     st.markdown("## 📁 Data Upload & Integration")
     with st.expander("Upload your CSV file", expanded=True):
         uploaded = st.file_uploader("Upload CSV Data (any columns)", type=["csv"])
         if uploaded:
             try:
-                df = pd.read_csv(uploaded)
+                df = load_csv(uploaded.getvalue())
                 st.success(f"CSV loaded: {len(df)} rows, {len(df.columns)} columns.")
+                if df.attrs.get('sampled'):
+                    st.warning("Large upload: showing the first 100,000 rows only.")
+                ok, missing = validate_columns(df, ['Date', 'Revenue'])
+                if not ok:
+                    st.warning(f"Missing expected columns: {', '.join(missing)}.")
             except Exception as e:
                 st.error(f"Error: {e}")
+                df = generate_sample_data()
+                st.info("Falling back to demo data.")
         else:
+            df = generate_sample_data()
             st.info("No file uploaded. Demo mode active.")
-        st.markdown("- Sample data and preview will be shown here.")
+        st.table(preview_frame(df))
+        if len(df.columns) > 50:
+            st.caption(f"Preview clipped to the first 50 of {len(df.columns)} columns.")
+        detected = detect_column_map(tuple(df.columns))
+        if detected:
+            st.caption("Auto-detected columns: " + ", ".join(f"{r} → {c}" for r, c in detected.items()))
         st.button("Reload data")
+@st.cache_data
+def _benchmark_sample(peer_group):
+    """Demo benchmark series, stable per peer group.
+
+    Seeding a Generator with the slider value keeps the chart steady
+    across reruns instead of re-sampling (and visually reshuffling) on
+    every interaction; a different peer group still gets its own series.
+    """
+    rng = np.random.default_rng(peer_group)
+    return rng.integers(75000, 120000, 7)
+
+
 def industry_benchmark_module():
     st.markdown("## ⚖️ Industry Benchmarking")
     with st.expander("Compare your metrics to the industry", expanded=True):
-        st.slider("Select industry peer group", min_value=1, max_value=5, value=3)
+        peer_group = st.slider("Select industry peer group", min_value=1, max_value=5, value=3)
         st.text_input("Industry or segment", value="SaaS")
         st.markdown("- View comparative charts and KPIs here.")
-        st.line_chart(np.random.randint(75000, 120000, 7))
+        st.line_chart(_benchmark_sample(peer_group))
+@st.cache_data
+def _forecast_table(date_labels, rev, exp, cust):
+    """Forecast table with preformatted cells, memoized on its contents.
+
+    Formatting happens once per column with map instead of Styler's
+    per-cell callback plus CSS/HTML generation; identical slider
+    positions reuse the cached frame outright.
+    """
+    dollars = '${:,.0f}'.format
+    return pd.DataFrame({
+        'Date': date_labels,
+        'Projected Revenue': pd.Series(rev).map(dollars),
+        'Projected Expenses': pd.Series(exp).map(dollars),
+        'Projected Customers': pd.Series(cust).map('{:,.0f}'.format)
+    })
+
+
+@st.cache_data
+def _forecast_dates(anchor_iso, periods=12):
+    """Forecast date axis, cached per calendar day.
+
+    Keyed on today's date so slider reruns reuse the same index instead
+    of re-running the date arithmetic 12 times per interaction.
+    """
+    return pd.date_range(anchor_iso, periods=periods, freq='30D')
+
+
+@st.cache_resource
+def _projection_fig():
+    """Template projection Figure, built once per process.
+
+    The singleton is shared across sessions and must never be mutated;
+    _session_projection_fig hands each session its own copy to write
+    data arrays into. plotly is imported here lazily (~200ms cold) so
+    sessions on other modules never pay for it.
+    """
+    import plotly.graph_objs as go
+    from echolon.charts import DARK_TEMPLATE
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        mode='lines+markers', name='Revenue',
+        line=dict(color='#3ECF8E', width=3), marker=dict(size=8),
+        hovertemplate='Projected Revenue<br>%{x|%b %Y}: <b>$%{y:,.0f}</b>'
+    ))
+    fig.add_trace(go.Scattergl(
+        mode='lines+markers', name='Expenses',
+        line=dict(color='#e74c3c', width=3, dash='dash'), marker=dict(size=8),
+        hovertemplate='Projected Expenses<br>%{x|%b %Y}: <b>$%{y:,.0f}</b>'
+    ))
+    fig.add_trace(go.Scattergl(
+        mode='lines+markers', name='Customers',
+        line=dict(color='#1f77b4', width=3, dash='dot'), marker=dict(size=8),
+        hovertemplate='Projected Customers<br>%{x|%b %Y}: <b>%{y:,.0f}</b>'
+    ))
+    fig.update_layout(
+        title='Business Projections (Data-Driven)',
+        legend=dict(x=0, y=1.1, orientation="h"),
+        xaxis_title='Date',
+        yaxis_title='Amount/USD',
+        template=DARK_TEMPLATE,
+        margin=dict(l=20, r=20, t=40, b=20),
+        hovermode='x unified')
+    return fig
+
+
+def _session_projection_fig():
+    """This session's copy of the projection figure template.
+
+    cache_resource objects are shared by every session and thread, so
+    the template is cloned once into session_state (same pattern as
+    goal_fig in app.py) and only the copy ever has its traces updated.
+    """
+    fig = st.session_state.get('projection_fig')
+    if fig is None:
+        import plotly.graph_objs as go
+        fig = go.Figure(_projection_fig())
+        st.session_state['projection_fig'] = fig
+    return fig
+
+
+# (metric, candidate column names) for resolving scenario base values;
+# new synonym aliases belong here, not in another copy-pasted scan
+_BASE_SPECS = (
+    ('Revenue', ('revenue', 'total_revenue', 'sales')),
+    ('Expenses', ('expenses', 'cost', 'total_expenses')),
+    ('Customers', ('customers', 'num_customers', 'customer_count')),
+)
+
+
+@st.fragment
 def scenario_modeling_module():
+    """Fragment-scoped: slider moves rerun only this module, not the
+    whole script (sidebar, theme, and the other modules stay put)."""
     st.markdown("## 📊 Scenario Modeling")
     with st.expander("Simulate future business outcomes", expanded=True):
-        # Data integration
-        uploaded = st.session_state.get('uploaded_csv') if 'uploaded_csv' in st.session_state else None
-        df = None
-        if uploaded is None:
+        # Data integration — only the parsed frame is kept across
+        # reruns; holding the raw UploadedFile too would double memory
+        # and risks re-reading a closed buffer
+        df = st.session_state.get('df')
+        if df is None:
             uploaded = st.file_uploader("Upload CSV Data (any columns)", type=["csv"])
             if uploaded:
                 try:
-                    df = pd.read_csv(uploaded)
-                    st.session_state['uploaded_csv'] = uploaded
+                    df = load_csv(uploaded.getvalue())
                     st.session_state['df'] = df
                 except Exception as e:
                     st.error(f"Error loading CSV: {e}")
             else:
                 st.info("No file uploaded. Demo mode active.")
-        else:
-            df = st.session_state.get('df')
 
-        # Defaults
-        fallback = {'Revenue': 100000, 'Expenses': 60000, 'Customers': 800}
-        last_revenue = fallback['Revenue']
-        last_expenses = fallback['Expenses']
-        last_customers = fallback['Customers']
+        # Defaults, overridden per metric by the resolution pass below
+        last = {'Revenue': 100000.0, 'Expenses': 60000.0, 'Customers': 800.0}
 
         latest_date = None
         if isinstance(df, pd.DataFrame):
-            # Flexible column name handling
-            rev_col = next((c for c in df.columns if c.lower() in ['revenue', 'total_revenue', 'sales']), None)
-            exp_col = next((c for c in df.columns if c.lower() in ['expenses', 'cost', 'total_expenses']), None)
-            cust_col = next((c for c in df.columns if c.lower() in ['customers', 'num_customers', 'customer_count']), None)
-
-            # Try to use the rightmost/latest row
-            try:
-                idx = -1
-                last_revenue = float(df[rev_col].iloc[idx]) if rev_col else fallback['Revenue']
-                last_expenses = float(df[exp_col].iloc[idx]) if exp_col else fallback['Expenses']
-                last_customers = float(df[cust_col].iloc[idx]) if cust_col else fallback['Customers']
-                latest_date = df.index[idx] if df.index.name else None
-            except Exception as e:
-                st.warning(f"Problem extracting data: using demo values. {e}")
+            # One data-driven pass over _BASE_SPECS: schema lowered
+            # once, O(1) lookups per candidate, latest-row scalars via
+            # .iat with presence and dtype checked up front
+            lm = {c.lower(): c for c in df.columns}
+            if len(df):
+                for metric, cands in _BASE_SPECS:
+                    col = next((lm[k] for k in cands if k in lm), None)
+                    if col and pd.api.types.is_numeric_dtype(df[col]):
+                        last[metric] = float(df.iat[-1, df.columns.get_loc(col)])
+                latest_date = df.index[-1] if df.index.name else None
+            else:
+                st.warning("Uploaded data is empty: using demo values.")
+        last_revenue = last['Revenue']
+        last_expenses = last['Expenses']
+        last_customers = last['Customers']
 
         # Inputs
         rv_growth = st.slider("Expected Revenue Growth (%)", -20, 60, 10)
@@ -103,50 +217,27 @@ def scenario_modeling_module():
         cust_growth = st.slider("Customer Growth (%)", -10, 30, 5)
 
         periods = 12
-        dates = [datetime.today() + timedelta(days=30 * i) for i in range(periods)]
-        revenue_proj = [last_revenue * (1 + rv_growth / 100) ** i for i in range(periods)]
-        expense_proj = [last_expenses * (exp_control / 100) ** i for i in range(periods)]
-        customers_proj = [last_customers * (1 + cust_growth / 100) ** i for i in range(periods)]
-
-        # Chart
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=dates, y=revenue_proj, mode='lines+markers', name='Revenue',
-            line=dict(color='#3ECF8E', width=3), marker=dict(size=8),
-            hovertemplate='Projected Revenue<br>%{x|%b %Y}: <b>$%{y:,.0f}</b>'
-        ))
-        fig.add_trace(go.Scatter(
-            x=dates, y=expense_proj, mode='lines+markers', name='Expenses',
-            line=dict(color='#e74c3c', width=3, dash='dash'), marker=dict(size=8),
-            hovertemplate='Projected Expenses<br>%{x|%b %Y}: <b>$%{y:,.0f}</b>'
-        ))
-        fig.add_trace(go.Scatter(
-            x=dates, y=customers_proj, mode='lines+markers', name='Customers',
-            line=dict(color='#1f77b4', width=3, dash='dot'), marker=dict(size=8),
-            hovertemplate='Projected Customers<br>%{x|%b %Y}: <b>%{y:,.0f}</b>'
-        ))
-        fig.update_layout(
-            title='Business Projections (Data-Driven)',
-            legend=dict(x=0, y=1.1, orientation="h"),
-            xaxis_title='Date',
-            yaxis_title='Amount/USD',
-            template='plotly_dark',
-            margin=dict(l=20, r=20, t=40, b=20),
-            hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
+        dates = _forecast_dates(datetime.today().date().isoformat(), periods)
+        # Closed-form geometric series, all three metrics in one 2D
+        # broadcast (one contiguous 3x12 allocation); float32 is plenty
+        # for display precision and halves the serialized chart payload
+        bases = np.array([last_revenue, last_expenses, last_customers], dtype=np.float64)
+        rates = np.array([1 + rv_growth / 100, exp_control / 100, 1 + cust_growth / 100])
+        proj = (bases[:, None] * rates[:, None] ** np.arange(periods)).astype(np.float32)
+        revenue_proj, expense_proj, customers_proj = proj
+
+        # Chart: reuse this session's Figure, swapping only the arrays
+        fig = _session_projection_fig()
+        for trace, ys in zip(fig.data, (revenue_proj, expense_proj, customers_proj)):
+            trace.x = dates
+            trace.y = ys
+        st.plotly_chart(fig, use_container_width=True, key="scenario_timeseries")
 
         # Table
-        forecast_df = pd.DataFrame({
-            'Date': [d.strftime('%b %Y') for d in dates],
-            'Projected Revenue': revenue_proj,
-            'Projected Expenses': expense_proj,
-            'Projected Customers': customers_proj
-        })
-        st.dataframe(forecast_df.style.format({
-            'Projected Revenue': "${:,.0f}",
-            'Projected Expenses': "${:,.0f}",
-            'Projected Customers': "{:,.0f}"
-        }), use_container_width=True)
+        st.dataframe(_forecast_table(tuple(dates.strftime('%b %Y')),
+                                     tuple(revenue_proj), tuple(expense_proj),
+                                     tuple(customers_proj)),
+                     use_container_width=True)
         st.markdown("### Monetizable Business Insight Summary")
         st.success(f"Projected annual revenue: ${revenue_proj[-1]:,.0f} (+{rv_growth}% growth scenario)")
         st.warning(f"Annual expenses could reach: ${expense_proj[-1]:,.0f} (Expense control: {exp_control}%)")
@@ -178,19 +269,16 @@ def collaboration_module():
 def stretch_goals_module():
     st.markdown("## 🚀 Stretch Goals & Roadmap")
     with st.expander("Planned advanced features", expanded=True):
-        st.markdown("- Predictive analytics\n- Real user feedback integration\n- Automated report generation\n- Many more (see GitHub issues)")
+        st.markdown(_STRETCH_MD)
 # ---------------- Sidebar Navigation -------------------
-modules = {
-    "Overview": overview_module,
-    "Data Upload/Integration": data_upload_module,
-    "Industry Benchmarking": industry_benchmark_module,
-    "Scenario Modeling": scenario_modeling_module,
-    "Goal Tracking": goal_tracking_module,
-    "AI Insights & Recommendations": ai_insights_module,
-    "Collaboration (Notes)": collaboration_module,
-    "Stretch Goals": stretch_goals_module,
-}
-sidebar_choice = st.sidebar.radio("Navigate Modules", list(modules.keys()), index=0)
+_MODULE_LABELS = ("Overview", "Data Upload/Integration", "Industry Benchmarking",
+                  "Scenario Modeling", "Goal Tracking", "AI Insights & Recommendations",
+                  "Collaboration (Notes)", "Stretch Goals")
+_MODULE_FUNCS = (overview_module, data_upload_module, industry_benchmark_module,
+                 scenario_modeling_module, goal_tracking_module, ai_insights_module,
+                 collaboration_module, stretch_goals_module)
+sidebar_choice = st.sidebar.radio("Navigate Modules", range(len(_MODULE_LABELS)),
+                                  format_func=_MODULE_LABELS.__getitem__, index=0)
 st.sidebar.markdown("---")
 st.sidebar.info("Use this list to switch modules. Each page is a feature placeholder and ready for further logic/coding!")
-modules[sidebar_choice]()
+_MODULE_FUNCS[sidebar_choice]()
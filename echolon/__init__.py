@@ -0,0 +1 @@
+# Echolon AI Dashboard - shared helpers package
@@ -0,0 +1,65 @@
+# Echolon AI Dashboard - shared Plotly figure builders
+"""Cached figure construction shared by the dashboard entrypoints.
+
+Builders are memoized on their (hashable) data arguments, so an
+unchanged section costs a cache lookup instead of rebuilding the figure
+graph and re-encoding the full Plotly JSON on every rerun.
+"""
+
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+# Registered once at import; figures reference it by name so the layout
+# dict is never rebuilt or re-validated per figure.
+_tmpl = go.layout.Template(pio.templates['plotly_dark'])
+_tmpl.layout.update(plot_bgcolor='#1E1E1E', paper_bgcolor='#22252A', font=dict(color='#EEE'))
+pio.templates['echolon_dark'] = _tmpl
+DARK_TEMPLATE = 'echolon_dark'
+
+
+@st.cache_resource
+def roi_channel_fig():
+    """Static ROI-by-channel bar; built once per process."""
+    channels = ['Email', 'Social Media', 'Paid Search', 'Organic', 'Direct']
+    roi = [450, 320, 280, 150, 520]
+    fig = px.bar(x=channels, y=roi, labels={'x': 'Channel', 'y': 'ROI (%)'}, title='Ad ROI by Channel')
+    fig.update_layout(template=DARK_TEMPLATE, margin=dict(l=20, r=20, t=40, b=20))
+    return fig
+
+
+@st.cache_resource
+def rev_exp_fig(fig_key, _dates, _rev, _exp):
+    """Daily revenue/expenses trend, built once per (source, month) key.
+
+    The data arguments are underscore-prefixed so only the cheap key is
+    hashed; the constructed Figure is reused as a singleton until the
+    underlying view changes.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=_dates, y=_rev, name='Revenue', line=dict(color='#3ECF8E')))
+    fig.add_trace(go.Scatter(x=_dates, y=_exp, name='Expenses', line=dict(color='#e74c3c')))
+    fig.update_layout(
+        title='Revenue vs. Expenses (daily)',
+        template=DARK_TEMPLATE,
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    return fig
+
+
+@st.cache_data
+def benchmark_fig(metrics, diffs):
+    """Bar chart of % difference vs. industry average per metric.
+
+    metrics/diffs are tuples so the cache key is cheap to hash.
+    """
+    colors = ['#3ECF8E' if d >= 0 else '#e74c3c' for d in diffs]
+    fig = go.Figure(go.Bar(x=list(metrics), y=list(diffs), marker_color=colors))
+    fig.update_layout(
+        title='% vs. industry average',
+        yaxis_title='% difference',
+        template=DARK_TEMPLATE,
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    return fig
@@ -0,0 +1,293 @@
+# Echolon AI Dashboard - shared data helpers
+"""Single home for demo-data generation and upload validation.
+
+Every dashboard entrypoint imports from here instead of defining its own
+copy, so @st.cache_data keys (which include the qualified function name)
+resolve to one shared cache entry per function.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+_SAMPLE_PARQUET = Path('.cache/sample.parquet')
+
+# Date names are checked first and on their own: regex alternation
+# picks the leftmost match in the string, so a fused pattern would let
+# 'Order_Date' claim the orders role instead of date. The metric roles
+# share one alternation; the named group that matched is the role.
+_DATE_RE = re.compile(r'date|time')
+_ROLE_RE = re.compile(
+    r'(?P<revenue>revenue|sales)|(?P<expenses>expense|cost)'
+    r'|(?P<customers>customer)|(?P<orders>order)|(?P<churn>churn)|(?P<conversion>conversion)')
+
+
+@st.cache_data
+def detect_column_map(columns):
+    """Map semantic roles to column names; cached per schema tuple.
+
+    Two lowered searches per column at most; the first column matching
+    a role claims it, and date-named columns only ever map to 'date'.
+    """
+    col_map = {}
+    for col in columns:
+        low = col.lower()
+        if _DATE_RE.search(low):
+            col_map.setdefault('date', col)
+            continue
+        m = _ROLE_RE.search(low)
+        if m and m.lastgroup not in col_map:
+            col_map[m.lastgroup] = col
+    return col_map
+
+
+_PREVIEW_ROWS = 10
+_PREVIEW_COLS = 50
+
+
+def preview_frame(df):
+    """Bounded slice for table previews.
+
+    Preview widgets serialize every cell they are handed, so wide frames
+    are clipped to the first 50 columns; callers caption the truncation
+    when it happens (len(df.columns) > 50).
+    """
+    return df.iloc[:_PREVIEW_ROWS, :_PREVIEW_COLS]
+
+
+def read_uploaded_csv(uploaded_file):
+    """Parse an uploaded CSV with pyarrow's multithreaded reader.
+
+    Columns are decoded in parallel and handed to pandas zero-copy;
+    falls back to pandas' own parser for files Arrow cannot tokenize.
+    """
+    try:
+        import pyarrow.csv as pacsv
+        tbl = pacsv.read_csv(uploaded_file, read_options=pacsv.ReadOptions(use_threads=True))
+        return tbl.to_pandas(split_blocks=True, self_destruct=True)
+    except Exception:
+        # Arrow already rejected the file, so engine='pyarrow' would too;
+        # retry with pandas' more forgiving C parser.
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file)
+
+
+@st.cache_data(persist='disk')
+def generate_sample_data():
+    """Generate one year (2024) of daily demo business data.
+
+    The frame is also persisted as a Parquet artifact so fresh sessions
+    load the columnar file instead of re-running the RNG; cache_data's
+    disk layer covers Streamlit's own pickle path on top.
+    """
+    if _SAMPLE_PARQUET.exists():
+        return pd.read_parquet(_SAMPLE_PARQUET, engine='pyarrow')
+    dates = pd.date_range('2024-01-01', '2024-12-31', freq='D')
+    n = len(dates)
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame({
+        'Date': dates,
+        'Revenue': rng.normal(50000, 8000, n).clip(min=0),
+        'Expenses': rng.normal(30000, 4000, n).clip(min=0),
+        'Customers': rng.integers(1000, 1500, n),
+        'Churn_Rate': rng.uniform(0.02, 0.08, n),
+        'Ad_Spend': rng.normal(5000, 800, n).clip(min=0),
+    })
+    # Narrow dtypes: display-grade precision, half the memory bandwidth
+    # for every downstream aggregation and serialization pass.
+    for c in ['Revenue', 'Expenses', 'Churn_Rate', 'Ad_Spend']:
+        data[c] = data[c].astype(np.float32, copy=False)
+    data['Customers'] = data['Customers'].astype(np.int32, copy=False)
+    _SAMPLE_PARQUET.parent.mkdir(exist_ok=True)
+    data.to_parquet(_SAMPLE_PARQUET, engine='pyarrow')
+    return data
+
+
+@st.cache_data
+def generate_benchmark_data():
+    """Static industry-average benchmarks (per-day figures)."""
+    return pd.DataFrame({
+        'Metric': ['Revenue', 'Expenses', 'Customers', 'Churn_Rate', 'Ad_Spend'],
+        'Industry_Average': [52000.0, 29500.0, 1350.0, 0.045, 5100.0],
+    })
+
+
+def _anomaly_report(df):
+    """Vectorized data-quality checks over the numeric block, in one pass.
+
+    Returns {column: [messages]}. All checks (all-zero, all-missing,
+    3-sigma outliers) read from a single ndarray view of the numeric
+    columns.
+    """
+    num_cols = df.select_dtypes('number').columns
+    anomalies = {}
+    # Date coverage: compare unique day counts on the int64-backed
+    # datetime64[D] view — no Python-level Timestamp hashing, and
+    # sub-day timestamps collapse onto their calendar day.
+    if 'Date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Date']):
+        days = df['Date'].dropna().to_numpy().astype('datetime64[D]')
+        if days.size:
+            unique_days = np.unique(days)
+            full_range = int((days.max() - days.min()).astype(int)) + 1
+            if unique_days.size != days.size:
+                anomalies.setdefault('Date', []).append('duplicate dates present')
+            if unique_days.size != full_range:
+                anomalies.setdefault('Date', []).append(
+                    f'{full_range - unique_days.size} missing day(s) in the covered range')
+    if len(num_cols) == 0:
+        return anomalies
+    values = df[num_cols].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mu = np.nanmean(values, axis=0)
+        sigma = np.nanstd(values, axis=0) + 1e-9
+        z = np.abs((values - mu) / sigma)
+    outlier_counts = np.nansum(z > 3, axis=0)
+    all_zero = (values == 0).all(axis=0)
+    all_null = np.isnan(values).all(axis=0)
+    for i, c in enumerate(num_cols):
+        msgs = []
+        if all_null[i]:
+            msgs.append('all values missing')
+        elif all_zero[i]:
+            msgs.append('all values are zero')
+        elif outlier_counts[i]:
+            msgs.append(f'{int(outlier_counts[i])} outlier(s) beyond 3 std devs')
+        if msgs:
+            anomalies[c] = msgs
+    return anomalies
+
+
+def source_hash(df):
+    """Stable 16-byte content hash for change detection across reruns.
+
+    blake2b over pd.util.hash_pandas_object's int64 row hashes — both
+    stages run in C, so hashing stays cheap next to recomputation and is
+    also used as the cache_data hash_func for frame arguments below.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: source_hash})
+def compute_anomalies(df):
+    """Cached anomaly report; reruns with an unchanged frame are a lookup."""
+    return _anomaly_report(df)
+
+
+@st.cache_data
+def stats_and_anomalies(ds_hash, _df):
+    """Summary stats + anomaly report for a registered data source.
+
+    Keyed on the source's content hash alone — the leading underscore
+    keeps Streamlit from deep-hashing the frame on every rerun.
+    """
+    num = _df.select_dtypes('number')
+    # Exactly the four wanted stats from one pass over the numeric
+    # block; describe() would also sort every column for quartiles.
+    vals = num.to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        stats = pd.DataFrame({
+            'mean': np.nanmean(vals, 0),
+            'std': np.nanstd(vals, 0),
+            'min': np.nanmin(vals, 0),
+            'max': np.nanmax(vals, 0),
+            'missing_values': np.isnan(vals).sum(0),
+        }, index=num.columns)
+    return stats, _anomaly_report(_df)
+
+
+@st.cache_data
+def compute_kpis(df_key, _df, kpi_cols):
+    """KPI aggregates in a single agg pass, memoized on the frame key.
+
+    kpi_cols is (revenue, expenses, customers); returns their
+    (sum, sum, mean) as plain floats.
+    """
+    agg = _df.agg({kpi_cols[0]: 'sum', kpi_cols[1]: 'sum', kpi_cols[2]: 'mean'})
+    return float(agg[kpi_cols[0]]), float(agg[kpi_cols[1]]), float(agg[kpi_cols[2]])
+
+
+@st.cache_data
+def metric_means(df_key, _df, metrics):
+    """Per-metric means from one fused pass, memoized on the frame key.
+
+    Every section comparing actuals to benchmarks reads from this dict,
+    so a rerun costs one cache lookup instead of a column scan per
+    metric per section.
+    """
+    means = _df[list(metrics)].mean()
+    return {m: float(means[m]) for m in metrics}
+
+
+# Module-level so renamed frames never transit session_state; capped so
+# long-lived processes don't accumulate one frame per upload forever
+_MAPPED_CACHE = {}
+_MAPPED_CACHE_MAX = 16
+
+
+def mapped_frame(df, df_hash, col_map):
+    """Frame with columns renamed to their canonical roles.
+
+    rename only reindexes columns but still rebuilds BlockManager
+    structures, so the result is kept in a module-level cache keyed on
+    (source hash, mapping) and reused until either changes. When the
+    cache is full the oldest entry is dropped; a miss just redoes the
+    rename.
+    """
+    key = (df_hash, tuple(sorted(col_map.items())))
+    cached = _MAPPED_CACHE.get(key)
+    if cached is None:
+        while len(_MAPPED_CACHE) >= _MAPPED_CACHE_MAX:
+            del _MAPPED_CACHE[next(iter(_MAPPED_CACHE))]
+        cached = df.rename(columns={v: k for k, v in col_map.items() if v})
+        _MAPPED_CACHE[key] = cached
+    return cached
+
+
+@st.cache_data(hash_funcs={pd.DataFrame: source_hash})
+def month_start_indices(df):
+    """Start index of each calendar month in a Date-sorted daily frame.
+
+    Returns 12 * n_years + 1 indices (January of the first covered year
+    through the January after the last) found with searchsorted on the
+    datetime64[M] view, so per-month filtering is an O(log n) lookup
+    plus a zero-copy iloc slice instead of a boolean mask and frame
+    copy. A dateless (e.g. header-only) frame yields all-zero indices.
+    """
+    m64 = df['Date'].to_numpy().astype('datetime64[M]')
+    # Coerced parse failures become NaT and sort to the end; drop them
+    # so the year-span arithmetic below sees only real months
+    m64 = m64[~np.isnat(m64)]
+    if m64.size == 0:
+        return np.zeros(13, dtype=np.intp)
+    first_jan = m64[0].astype('datetime64[Y]').astype('datetime64[M]')
+    n_years = int(m64[-1].astype('datetime64[Y]') - m64[0].astype('datetime64[Y]')) + 1
+    grid = first_jan + np.arange(12 * n_years + 1)
+    return np.searchsorted(m64, grid)
+
+
+def month_slice(df, month):
+    """Rows for calendar month `month` (1-12) across all covered years.
+
+    Single-year frames come back as a zero-copy view; multi-year frames
+    concatenate one slice per year.
+    """
+    starts = month_start_indices(df)
+    n_years = (len(starts) - 1) // 12
+    if n_years == 1:
+        return df.iloc[starts[month - 1]:starts[month]]
+    return pd.concat(df.iloc[starts[y * 12 + month - 1]:starts[y * 12 + month]]
+                     for y in range(n_years))
+
+
+def validate_columns(df, required):
+    """Check an uploaded frame for required columns.
+
+    Returns (ok, missing) where missing lists the absent column names.
+    """
+    missing = list(set(required) - set(df.columns))
+    return not missing, missing
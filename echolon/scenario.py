@@ -0,0 +1,26 @@
+# Echolon AI Dashboard - scenario projection math
+"""Reusable kernel for the "What If?" scenario sliders.
+
+Slider-driven reruns call project() with the already-materialized NumPy
+arrays, so each rerun is a couple of fused ufunc passes over contiguous
+float32 data — no per-row Python loop and no pandas round-trips.
+"""
+
+import numpy as np
+
+# Fraction of an ad-spend change assumed to convert into revenue.
+AD_SPEND_ELASTICITY = 0.3
+
+
+def project(revenue, customers, price_f, spend_f, churn_delta):
+    """Apply a pricing/ad-spend/churn scenario to observed series.
+
+    revenue, customers: 1-D ndarrays (customers may be None).
+    price_f, spend_f: multiplicative factors, e.g. 1.05 for +5%.
+    churn_delta: absolute churn-rate change, e.g. 0.02 for +2pts.
+    Returns (projected_revenue, projected_customers).
+    """
+    factor = price_f * (1.0 + AD_SPEND_ELASTICITY * (spend_f - 1.0)) * (1.0 - churn_delta)
+    out_rev = revenue * np.float32(factor)
+    out_cust = None if customers is None else customers * np.float32(1.0 - churn_delta)
+    return out_rev, out_cust
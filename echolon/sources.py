@@ -0,0 +1,128 @@
+# Echolon AI Dashboard - data source connectors
+"""Ingestion helpers shared by the dashboard entrypoints.
+
+load_csv is keyed on the raw upload bytes, so slider/selectbox reruns
+return the already-parsed frame from cache instead of re-tokenizing the
+whole file on every interaction.
+"""
+
+import io
+import json
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from echolon.data import read_uploaded_csv
+
+# Loaded frames live at module scope; session_state carries only their
+# ids, so Streamlit's per-rerun session-state inspection stays O(number
+# of sources) instead of O(total frame bytes). The store is capped:
+# once full, the oldest frame is evicted (dicts iterate in insertion
+# order) and later get_df calls for its id return None, which callers
+# already treat as a restarted process.
+_DF_STORE = {}
+_DF_STORE_MAX = 16
+
+
+def store_df(df):
+    """Park a frame in the module-level store; returns its id."""
+    while len(_DF_STORE) >= _DF_STORE_MAX:
+        del _DF_STORE[next(iter(_DF_STORE))]
+    df_id = uuid.uuid4().hex
+    _DF_STORE[df_id] = df
+    return df_id
+
+
+def get_df(df_id):
+    """Fetch a stored frame (None if the process restarted since)."""
+    return _DF_STORE.get(df_id)
+
+
+def _shrink(df):
+    """Downcast 64-bit numerics to the narrowest safe width.
+
+    Halves the bytes every downstream sum/mean/groupby has to move; the
+    dashboard only ever displays rounded figures.
+    """
+    for c in df.select_dtypes('float').columns:
+        df[c] = pd.to_numeric(df[c], downcast='float')
+    for c in df.select_dtypes('integer').columns:
+        df[c] = pd.to_numeric(df[c], downcast='integer')
+    return df
+
+
+def _prepare(df):
+    """Post-parse normalization done once inside the cached load path.
+
+    Downcasts numerics and, when a Date column exists, parses and sorts
+    it here so reruns never repeat the O(n) datetime work.
+    """
+    df = _shrink(df)
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce', cache=True)
+        df = df.sort_values('Date', ignore_index=True)
+    return df
+
+
+@st.cache_resource
+def _requests_session():
+    """One HTTP session per process — pooled keep-alive connections."""
+    import requests
+    return requests.Session()
+
+
+@st.cache_resource
+def _gspread_client():
+    """Authenticated Google Sheets client, built once and shared.
+
+    gspread is an optional dependency; importing lazily keeps the rest
+    of the app working without it.
+    """
+    import gspread
+    return gspread.service_account()
+
+
+@st.cache_data(show_spinner=False)
+def parse_headers(raw):
+    """Parse the custom-headers JSON once per distinct input string."""
+    return json.loads(raw) if raw else {}
+
+
+def fetch_api_csv(endpoint, headers=None):
+    """Download a CSV from an HTTP endpoint via the shared session.
+
+    The body is buffered once into BytesIO before parsing: resp.raw is
+    not seekable, so feeding it to the Arrow parser directly would leave
+    the pandas fallback unable to rewind when Arrow rejects the file.
+    """
+    resp = _requests_session().get(endpoint, headers=headers or {}, timeout=30)
+    resp.raise_for_status()
+    return _prepare(read_uploaded_csv(io.BytesIO(resp.content)))
+
+
+def fetch_gsheet(sheet_url):
+    """Load the first worksheet of a Google Sheet as a DataFrame."""
+    ws = _gspread_client().open_by_url(sheet_url).sheet1
+    return _prepare(pd.DataFrame(ws.get_all_records()))
+
+
+# Uploads past this size are row-sampled instead of parsed in full: the
+# dashboard only shows previews and aggregates, and fully parsing a
+# multi-GB file would exhaust the worker's memory.
+_MAX_FULL_PARSE = 100 * 1024 * 1024
+_SAMPLE_ROWS = 100_000
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_csv(raw_bytes):
+    """Parse CSV bytes once per distinct upload (1h TTL bounds memory).
+
+    Oversized uploads keep only the first _SAMPLE_ROWS rows; the frame
+    carries attrs['sampled'] = True so callers can caption the cut.
+    """
+    if len(raw_bytes) > _MAX_FULL_PARSE:
+        df = _prepare(pd.read_csv(io.BytesIO(raw_bytes), nrows=_SAMPLE_ROWS))
+        df.attrs['sampled'] = True
+        return df
+    return _prepare(read_uploaded_csv(io.BytesIO(raw_bytes)))
@@ -0,0 +1,34 @@
+# Echolon AI Dashboard - shared dark theme
+"""One validated CSS block for every entrypoint.
+
+inject_theme() is memoized with st.cache_resource so the style payload is
+built once per process; callers still invoke it at the top of each run so
+the markdown lands in the page, but the string itself is never rebuilt.
+"""
+
+import streamlit as st
+
+_CSS = '''<style>
+body, .stApp {background-color: #181C24 !important; color: #F3F6F9 !important;}
+header {background: none !important;}
+.urgent {color: red; font-weight: bold;}
+.owner {color: #3ECF8E !important;}
+.metric-card {background: #202634; border-radius: 16px; padding: 24px 8px; text-align: center; margin: 8px; color: #F3F6F9;}
+.kpiIcon {font-size: 32px; margin-bottom: 8px;}
+</style>'''
+
+
+@st.cache_resource
+def _theme_css():
+    return _CSS
+
+
+def inject_theme():
+    """Emit the dashboard dark theme exactly once per rerun.
+
+    The markdown call must run on every rerun: Streamlit drops elements
+    that a script does not re-emit, so gating this behind a session_state
+    flag would unstyle the page on the second rerun. The cached string
+    keeps the per-rerun cost to a single markdown element.
+    """
+    st.markdown(_theme_css(), unsafe_allow_html=True)